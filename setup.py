@@ -64,15 +64,11 @@ def main():
               'Framework :: Robot Framework',
               'License :: OSI Approved :: Apache Software License',
               'Operating System :: OS Independent',
-              'Programming Language :: Python :: 2',
-              'Programming Language :: Python :: 2.7',
               'Programming Language :: Python :: 3',
-              'Programming Language :: Python :: 3.4',
-              'Programming Language :: Python :: 3.5',
-              'Programming Language :: Python :: 3.6',
               'Topic :: Software Development :: Testing',
           ],
           packages=['SnmpLibrary'],
+          python_requires='>=3.7',
           install_requires=['robotframework', 'pysnmp'],
           cmdclass={
               'build_libdoc': run_build_libdoc,
@@ -16,6 +16,7 @@ import os.path
 import warnings
 from itertools import islice
 from pyasn1.compat.octets import null
+from robot.api import logger
 from robot.utils.connectioncache import ConnectionCache
 
 from .traps import _Traps
@@ -24,29 +25,92 @@ from . import __version__
 
 with warnings.catch_warnings():
     warnings.filterwarnings("ignore", category=DeprecationWarning)
-    from pysnmp.smi import builder
-    from pysnmp.entity import engine
-    from pysnmp.entity.rfc3413.oneliner import cmdgen
+    from pysnmp import hlapi
+    from pysnmp.smi import error as smi_error
     from pyasn1.type import univ
     from pysnmp.proto import rfc1902, rfc1905
 
+# Pre-bound sentinel instances for the type checks on the hot path, so
+# the per-call/per-row allocations are hoisted to import time.
+_OCTET_STRING = univ.OctetString()
+_OBJECT_IDENTIFIER = rfc1902.ObjectIdentifier()
+
+
+def _make_object_type(oid, *value):
+    # Build an hlapi varbind from the tuple forms produced by
+    # utils.parse_oid.
+    if isinstance(oid[0], tuple):
+        mib, sym = oid[0]
+        identity = hlapi.ObjectIdentity(mib, sym, *oid[1:])
+    else:
+        identity = hlapi.ObjectIdentity(oid)
+    return hlapi.ObjectType(identity, *value)
+
 
 class _SnmpConnection:
 
+    __slots__ = ('engine', 'builder', 'authentication_data',
+                 'context_data', 'transport_target', 'prefetched_table',
+                 'loaded_mibs', 'resolved_oids')
+
     def __init__(self, authentication, transport_target, context_name=null):
-        eng = engine.SnmpEngine()
-        self.builder = eng.msgAndPduDsp.mibInstrumController.mibBuilder
+        self.engine = hlapi.SnmpEngine()
+        self.builder = self.engine.getMibBuilder()
 
-        self.cmd_gen = cmdgen.CommandGenerator(eng)
         self.authentication_data = authentication
-        self.context_name = context_name
+        self.context_data = hlapi.ContextData(contextName=context_name)
         self.transport_target = transport_target
 
         self.prefetched_table = {}
+        self.loaded_mibs = set()
+        self.resolved_oids = {}
 
     def close(self):
-        # nothing to do atm
-        pass
+        # The dispatcher is created lazily on the first request and then
+        # keeps the UDP socket open so subsequent requests can reuse it.
+        # Release it here so closed connections do not pin file
+        # descriptors for the rest of the run.
+        dispatcher = self.engine.transportDispatcher
+        if dispatcher is not None:
+            dispatcher.closeDispatcher()
+
+
+# The Convert To <Type> and Set <Type> keyword pairs only differ in the
+# SNMP type they wrap, so they are generated from this table. Each
+# generated method closes over the rfc1902 class, turning the type
+# lookup into a bound reference instead of a per-call attribute walk.
+_SNMP_TYPES = {
+    'octetstring': rfc1902.OctetString,
+    'integer': rfc1902.Integer,
+    'integer32': rfc1902.Integer32,
+    'counter32': rfc1902.Counter32,
+    'counter64': rfc1902.Counter64,
+    'gauge32': rfc1902.Gauge32,
+    'unsigned32': rfc1902.Unsigned32,
+    'timeticks': rfc1902.TimeTicks,
+}
+
+
+def _make_converter(name, cls):
+    def converter(self, value):
+        return cls(value)
+    converter.__name__ = 'convert_to_' + name
+    converter.__doc__ = ('Converts a value to a SNMP %s object.' %
+                         cls.__name__)
+    return converter
+
+
+def _make_setter(name, cls):
+    def setter(self, oid, value, idx=(0,)):
+        self.set(oid, cls(value), idx)
+    setter.__name__ = 'set_' + name
+    setter.__doc__ = ("""Does a SNMP SET request after converting the value to a
+        %s SNMP Object.
+
+        This is a convenient keyword, it does the same as a `Convert To
+        %s` followed by a `Set`.
+        """ % (cls.__name__, cls.__name__))
+    return setter
 
 
 class SnmpLibrary(_Traps):
@@ -54,6 +118,8 @@ class SnmpLibrary(_Traps):
     ROBOT_LIBRARY_VERSION = __version__
     ROBOT_LIBRARY_SCOPE = 'TEST SUITE'
 
+    __slots__ = ('_active_connection', '_cache')
+
     def __init__(self):
         _Traps.__init__(self)
         self._active_connection = None
@@ -82,9 +148,9 @@ class SnmpLibrary(_Traps):
         if alias:
             alias = str(alias)
 
-        authentication_data = cmdgen.CommunityData(self.AGENT_NAME,
-                                                   community_string)
-        transport_target = cmdgen.UdpTransportTarget(
+        authentication_data = hlapi.CommunityData(self.AGENT_NAME,
+                                                  community_string)
+        transport_target = hlapi.UdpTransportTarget(
                                         (host, port), timeout, retries)
 
         connection = _SnmpConnection(authentication_data, transport_target)
@@ -137,9 +203,9 @@ class SnmpLibrary(_Traps):
 
         try:
             authentication_protocol = {
-                None: cmdgen.usmNoAuthProtocol,
-                'MD5': cmdgen.usmHMACMD5AuthProtocol,
-                'SHA': cmdgen.usmHMACSHAAuthProtocol
+                None: hlapi.usmNoAuthProtocol,
+                'MD5': hlapi.usmHMACMD5AuthProtocol,
+                'SHA': hlapi.usmHMACSHAAuthProtocol
             }[authentication_protocol]
         except KeyError:
             raise RuntimeError('Invalid authentication protocol %s' %
@@ -150,25 +216,25 @@ class SnmpLibrary(_Traps):
 
         try:
             encryption_protocol = {
-                None: cmdgen.usmNoPrivProtocol,
-                'DES': cmdgen.usmDESPrivProtocol,
-                '3DES': cmdgen.usm3DESEDEPrivProtocol,
-                'AES128': cmdgen.usmAesCfb128Protocol,
-                'AES192': cmdgen.usmAesCfb192Protocol,
-                'AES256': cmdgen.usmAesCfb256Protocol,
+                None: hlapi.usmNoPrivProtocol,
+                'DES': hlapi.usmDESPrivProtocol,
+                '3DES': hlapi.usm3DESEDEPrivProtocol,
+                'AES128': hlapi.usmAesCfb128Protocol,
+                'AES192': hlapi.usmAesCfb192Protocol,
+                'AES256': hlapi.usmAesCfb256Protocol,
             }[encryption_protocol]
         except KeyError:
             raise RuntimeError('Invalid encryption protocol %s' %
                                encryption_protocol)
 
-        authentication_data = cmdgen.UsmUserData(
+        authentication_data = hlapi.UsmUserData(
                                     user,
                                     password,
                                     encryption_password,
                                     authentication_protocol,
                                     encryption_protocol)
 
-        transport_target = cmdgen.UdpTransportTarget(
+        transport_target = hlapi.UdpTransportTarget(
                                         (host, port), timeout, retries)
 
         conn = _SnmpConnection(authentication_data, transport_target, context_name)
@@ -216,10 +282,17 @@ class SnmpLibrary(_Traps):
         """
 
         self._info('Adding MIB path %s' % (path,))
-        if not os.path.exists(path):
+        if not os.path.isdir(path):
             raise RuntimeError('Path "%s" does not exist' % path)
 
+        # Normalize and dedupe; every MIB lookup walks the whole search
+        # path, so repeated suite setups must not let it grow unbounded.
+        path = os.path.realpath(path)
         paths = self._active_connection.builder.getMibPath()
+        if path in paths:
+            self._debug('Path already in search path')
+            return
+
         paths += (path, )
         self._debug('New paths: %s' % ' '.join(paths))
         self._active_connection.builder.setMibPath(*paths)
@@ -237,27 +310,84 @@ class SnmpLibrary(_Traps):
 
         Note: Preloading all MIBs take a long time.
         """
+        conn = self._active_connection
         if len(names):
-            self._info('Preloading MIBs %s' % ' '.join(list(names)))
+            # MIBs already loaded on this connection would only be
+            # re-parsed, so skip them.
+            names = tuple(n for n in names if n not in conn.loaded_mibs)
+            if not names:
+                return
+            self._info('Preloading MIBs %s' % ' '.join(names))
         else:
             self._info('Preloading all available MIBs')
-        self._active_connection.builder.loadModules(*names)
+        conn.builder.loadModules(*names)
+        conn.loaded_mibs.update(names)
 
-    def _get(self, oid, idx=(0,), expect_display_string=False):
+    def preload_mibs_from_file(self, path):
+        """Preloads all MIBs listed in the given file.
 
-        if self._active_connection is None:
+        The file must contain one MIB name per line; empty lines and
+        lines starting with `#` are ignored. All MIBs are loaded with a
+        single bulk call, which is considerably faster than one
+        `Preload MIBs` call per MIB name.
+
+        Example:
+        | Preload MIBs From File | ${CURDIR}/mibs.txt |
+        """
+
+        names = list()
+        with open(path) as f:
+            for line in f:
+                line = line.strip()
+                if line and not line.startswith('#'):
+                    names.append(line)
+
+        if not names:
+            raise RuntimeError('No MIB names found in "%s"' % path)
+
+        self.preload_mibs(*names)
+
+    def _resolve_oid(self, oid):
+        # Resolve a leading MIB symbol to its numeric form once and
+        # cache it on the connection, so subsequent calls with the same
+        # symbol skip pysnmp's symbol table walk.
+        oid = utils.parse_oid(oid)
+        if not isinstance(oid[0], tuple):
+            return oid
+        mib, sym = oid[0]
+        if not mib:
+            # without a MIB name pysnmp searches all loaded modules
+            return oid
+        conn = self._active_connection
+        numeric = conn.resolved_oids.get((mib, sym))
+        if numeric is None:
+            try:
+                obj, = conn.builder.importSymbols(mib, sym)
+            except smi_error.SmiError:
+                # let the command generator resolve (and report) it
+                return oid
+            numeric = tuple(obj.getName())
+            conn.resolved_oids[(mib, sym)] = numeric
+        return numeric + oid[1:]
+
+    def _get(self, oid, idx=(0,), expect_display_string=False, raw=False):
+
+        conn = self._active_connection
+        if conn is None:
             raise RuntimeError('No transport host set')
 
         idx = utils.parse_idx(idx)
-        oid = utils.parse_oid(oid) + idx
-
-        error_indication, error, _, var = \
-            self._active_connection.cmd_gen.getCmd(
-                self._active_connection.authentication_data,
-                self._active_connection.transport_target,
-                oid,
-                contextName=self._active_connection.context_name
+        oid = self._resolve_oid(oid) + idx
+
+        error_indication, error, _, var = next(
+            hlapi.getCmd(
+                conn.engine,
+                conn.authentication_data,
+                conn.transport_target,
+                conn.context_data,
+                _make_object_type(oid)
             )
+        )
 
         if error_indication is not None:
             raise RuntimeError('SNMP GET failed: %s' % error_indication)
@@ -266,15 +396,23 @@ class SnmpLibrary(_Traps):
 
         oid, obj = var[0]
 
+        return self._extract_value(oid, obj, expect_display_string, raw)
+
+    def _extract_value(self, oid, obj, expect_display_string=False,
+                       raw=False):
         if isinstance(obj, rfc1905.NoSuchInstance):
             raise RuntimeError('Object with OID %s not found' %
                                utils.format_oid(oid))
 
+        if raw:
+            # skip the prettyOut conversion and the log line entirely
+            return obj
+
         if expect_display_string:
-            if not univ.OctetString().isSuperTypeOf(obj):
+            if not _OCTET_STRING.isSuperTypeOf(obj):
                 raise RuntimeError('Returned value is not an octetstring')
             value = obj.prettyOut(obj)
-        elif univ.OctetString().isSuperTypeOf(obj):
+        elif _OCTET_STRING.isSuperTypeOf(obj):
             value = obj.asNumbers()
         else:
             value = obj.prettyOut(obj)
@@ -298,6 +436,71 @@ class SnmpLibrary(_Traps):
         """
         return self._get(oid, idx)
 
+    def get_raw(self, oid, idx=(0,)):
+        """Does a SNMP GET request for the specified 'oid' and returns
+        the raw pyasn1 object.
+
+        Unlike `Get`, the value is neither pretty-printed nor converted,
+        which avoids the formatting overhead when the value is only
+        processed programmatically.
+
+        For more information and an example see `Get`.
+        """
+        return self._get(oid, idx, raw=True)
+
+    def get_many(self, *oids):
+        """Does a SNMP GET request for multiple OIDs at once.
+
+        All OIDs are packed into a single request PDU, so any number of
+        values is fetched with one round trip to the agent instead of
+        one per OID. See `Get` for possible OID notations. After each
+        OID, you can give an index (`idx`, see example below) which is
+        appended to the OID. By default the index is `.0`.
+
+        Returns the values as a list in the order of the given OIDs.
+
+        Examples:
+        | ${values}= | Get Many | SNMPv2-MIB::sysDescr | SNMPv2-MIB::sysName | | |
+        | ${values}= | Get Many | IF-MIB::ifDescr | idx=1 | IF-MIB::ifDescr | idx=2 |
+        """
+
+        conn = self._active_connection
+        if conn is None:
+            raise RuntimeError('No transport host set')
+
+        args = list(oids)
+        parsed_oids = list()
+        while len(args):
+            oid = args.pop(0)
+            possible_idx = args[0] if len(args) > 0 else ''
+            if utils.is_string(possible_idx) and \
+                    possible_idx.startswith('idx='):
+                idx = args.pop(0)[4:]
+            else:
+                idx = (0,)
+            idx = utils.parse_idx(idx)
+            parsed_oids.append(self._resolve_oid(oid) + idx)
+
+        if len(parsed_oids) < 1:
+            raise RuntimeError('You must specify at least one OID')
+
+        error_indication, error, _, var = next(
+            hlapi.getCmd(
+                conn.engine,
+                conn.authentication_data,
+                conn.transport_target,
+                conn.context_data,
+                *[_make_object_type(oid) for oid in parsed_oids]
+            )
+        )
+
+        if error_indication is not None:
+            raise RuntimeError('SNMP GET failed: %s' % error_indication)
+        if error != 0:
+            raise RuntimeError('SNMP GET failed: %s' % error.prettyPrint())
+
+        return [self._extract_value(oid, obj) for oid, obj in var]
+
     def get_display_string(self, oid, idx=(0,)):
         """Does a SNMP GET request for the specified 'oid' and convert it to
         display string.
@@ -310,13 +513,16 @@ class SnmpLibrary(_Traps):
         for oid, value in oid_values:
             self._info('Setting OID %s to %s' % (utils.format_oid(oid), value))
 
-        error_indication, error, _, var = \
-            self._active_connection.cmd_gen.setCmd(
-                self._active_connection.authentication_data,
-                self._active_connection.transport_target,
-                *oid_values,
-                contextName=self._active_connection.context_name
+        conn = self._active_connection
+        error_indication, error, _, var = next(
+            hlapi.setCmd(
+                conn.engine,
+                conn.authentication_data,
+                conn.transport_target,
+                conn.context_data,
+                *[_make_object_type(oid, value) for oid, value in oid_values]
             )
+        )
 
         if error_indication is not None:
             raise RuntimeError('SNMP SET failed: %s' % error_indication)
@@ -343,7 +549,7 @@ class SnmpLibrary(_Traps):
             raise RuntimeError('No transport host set')
 
         idx = utils.parse_idx(idx)
-        oid = utils.parse_oid(oid) + idx
+        oid = self._resolve_oid(oid) + idx
         self._set((oid, value))
 
     def set_many(self, *oid_value_pairs):
@@ -376,7 +582,7 @@ class SnmpLibrary(_Traps):
                 else:
                     idx = (0,)
                 idx = utils.parse_idx(idx)
-                oid = utils.parse_oid(oid) + idx
+                oid = self._resolve_oid(oid) + idx
                 oid_values.append((oid, value))
         except IndexError:
             raise RuntimeError('Invalid OID/value(/index) format')
@@ -388,31 +594,34 @@ class SnmpLibrary(_Traps):
     def walk(self, oid):
         """Does a SNMP WALK request and returns the result as OID list."""
 
-        if self._active_connection is None:
+        conn = self._active_connection
+        if conn is None:
             raise RuntimeError('No transport host set')
 
         self._info('Walk starts at OID %s' % (oid, ))
-        oid = utils.parse_oid(oid)
+        oid = self._resolve_oid(oid)
 
-        error_indication, error, _, var_bind_table = \
-            self._active_connection.cmd_gen.nextCmd(
-                self._active_connection.authentication_data,
-                self._active_connection.transport_target,
-                oid,
-                contextName=self._active_connection.context_name
-            )
-
-        if error_indication:
-            raise RuntimeError('SNMP WALK failed: %s' % error_indication)
-        if error != 0:
-            raise RuntimeError('SNMP WALK failed: %s' % error.prettyPrint())
+        iterator = hlapi.nextCmd(
+            conn.engine,
+            conn.authentication_data,
+            conn.transport_target,
+            conn.context_data,
+            _make_object_type(oid),
+            lexicographicMode=False
+        )
 
         oids = list()
-        for var_bind_table_row in var_bind_table:
+        for error_indication, error, _, var_bind_table_row in iterator:
+            if error_indication:
+                raise RuntimeError('SNMP WALK failed: %s' % error_indication)
+            if error != 0:
+                raise RuntimeError('SNMP WALK failed: %s' %
+                                   error.prettyPrint())
+
             oid, obj = var_bind_table_row[0]
-            oid = ''.join(('.', str(oid)))
-            if obj.isSuperTypeOf(rfc1902.ObjectIdentifier()):
-                obj = ''.join(('.', str(obj)))
+            oid = '.' + str(oid)
+            if obj.isSuperTypeOf(_OBJECT_IDENTIFIER):
+                obj = '.' + str(obj)
             else:
                 obj = obj.prettyOut(obj)
             self._info('%s: %s' % (oid, obj))
@@ -517,37 +726,10 @@ class SnmpLibrary(_Traps):
         else:
             return oid[-length:]
 
-    def convert_to_octetstring(self, value):
-        """Converts a value to a SNMP OctetString object."""
-        return rfc1902.OctetString(value)
-
-    def convert_to_integer(self, value):
-        """Converts a value to a SNMP Integer object."""
-        return rfc1902.Integer(value)
-
-    def convert_to_integer32(self, value):
-        """Converts a value to a SNMP Integer32 object."""
-        return rfc1902.Integer32(value)
-
-    def convert_to_counter32(self, value):
-        """Converts a value to a SNMP Counter32 object."""
-        return rfc1902.Counter32(value)
-
-    def convert_to_counter64(self, value):
-        """Converts a value to a SNMP Counter64 object."""
-        return rfc1902.Counter64(value)
-
-    def convert_to_gauge32(self, value):
-        """Converts a value to a SNMP Gauge32 object."""
-        return rfc1902.Gauge32(value)
-
-    def convert_to_unsigned32(self, value):
-        """Converts a value to a SNMP Unsigned32 object."""
-        return rfc1902.Unsigned32(value)
-
-    def convert_to_timeticks(self, value):
-        """Converts a value to a SNMP TimeTicks object."""
-        return rfc1902.TimeTicks(value)
+    for _name, _cls in _SNMP_TYPES.items():
+        locals()['convert_to_' + _name] = _make_converter(_name, _cls)
+        locals()['set_' + _name] = _make_setter(_name, _cls)
+    del _name, _cls
 
     def convert_to_ip_address(self, value):
         """Converts a value to a SNMP IpAddress object.
@@ -559,88 +741,6 @@ class SnmpLibrary(_Traps):
             value = str(value)
         return rfc1902.IpAddress(value)
 
-    def set_octetstring(self, oid, value, idx=(0,)):
-        """Does a SNMP SET request after converting the value to an
-        OctetString SNMP Object.
-
-        This is a convenient keyword, it does the same as a `Convert To
-        OctetString` followed by a `Set`.
-        """
-
-        value = self.convert_to_octetstring(value)
-        self.set(oid, value, idx)
-
-    def set_integer(self, oid, value, idx=(0,)):
-        """Does a SNMP SET request after converting the value to an
-        Integer SNMP Object.
-
-        This is a convenient keyword, it does the same as a `Convert To
-        Integer` followed by a `Set`.
-        """
-
-        value = self.convert_to_integer(value)
-        self.set(oid, value, idx)
-
-    def set_integer32(self, oid, value, idx=(0,)):
-        """Does a SNMP SET request after converting the value to an
-        Integer32 SNMP Object.
-
-        See also `Set Integer`.
-        """
-
-        value = self.convert_to_integer32(value)
-        self.set(oid, value, idx)
-
-    def set_counter32(self, oid, value, idx=(0,)):
-        """Does a SNMP SET request after converting the value to a
-        Counter32 SNMP Object.
-
-        See also `Set Integer`.
-        """
-
-        value = self.convert_to_counter32(value)
-        self.set(oid, value, idx)
-
-    def set_counter64(self, oid, value, idx=(0,)):
-        """Does a SNMP SET request after converting the value to a
-        Counter64 SNMP Object.
-
-        See also `Set Integer`.
-        """
-
-        value = self.convert_to_counter64(value)
-        self.set(oid, value, idx)
-
-    def set_gauge32(self, oid, value, idx=(0,)):
-        """Does a SNMP SET request after converting the value to a
-        Gauge32 SNMP Object.
-
-        See also `Set Integer`.
-        """
-
-        value = self.convert_to_gauge32(value)
-        self.set(oid, value, idx)
-
-    def set_unsigned32(self, oid, value, idx=(0,)):
-        """Does a SNMP SET request after converting the value to a
-        Unsigned32 SNMP Object.
-
-        See also `Set Integer`.
-        """
-
-        value = self.convert_to_unsigned32(value)
-        self.set(oid, value, idx)
-
-    def set_timeticks(self, oid, value, idx=(0,)):
-        """Does a SNMP SET request after converting the value to a
-        TimeTicks SNMP Object.
-
-        See also `Set Integer`.
-        """
-
-        value = self.convert_to_timeticks(value)
-        self.set(oid, value, idx)
-
     def set_ip_address(self, oid, value, idx=(0,)):
         """Does a SNMP SET request after converting the value to an
         IpAddress SNMP Object.
@@ -659,29 +759,13 @@ class SnmpLibrary(_Traps):
         value = self.convert_to_ip_address(value)
         self.set(oid, value, idx)
 
+    # All log levels used internally are known-good literals, so there
+    # is no point in validating and uppercasing them on every call.
     def _warn(self, msg):
-        self._log(msg, 'WARN')
+        logger.warn(msg)
 
     def _info(self, msg):
-        self._log(msg, 'INFO')
+        logger.info(msg)
 
     def _debug(self, msg):
-        self._log(msg, 'DEBUG')
-
-    def _log(self, msg, level=None):
-        self._is_valid_log_level(level, raise_if_invalid=True)
-        msg = msg.strip()
-        if level is None:
-            level = self._default_log_level
-        if msg != '':
-            print('*%s* %s' % (level.upper(), msg))
-
-    def _is_valid_log_level(self, level, raise_if_invalid=False):
-        if level is None:
-            return True
-        if utils.is_string(level) and \
-                level.upper() in ['TRACE', 'DEBUG', 'INFO', 'WARN', 'HTML']:
-            return True
-        if not raise_if_invalid:
-            return False
-        raise RuntimeError("Invalid log level '%s'" % level)
+        logger.debug(msg)
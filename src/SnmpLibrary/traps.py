@@ -82,6 +82,9 @@ def _trap_receiver(trap_filter, host, port, timeout):
 
 
 class _Traps:
+
+    __slots__ = ('_trap_filters',)
+
     def __init__(self):
         self._trap_filters = dict()
 
@@ -12,20 +12,52 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import sys
+import functools
+import re
+
+# Matches the most common OID notation, e.g. '.1.3.6.1.2.1.1.1.0'.
+_NUMERIC_OID_RE = re.compile(r'\A\.\d+(?:\.\d+)*\Z')
+
+# Tokenizes symbolic notations like 'SNMPv2-MIB::sysDescr.0' and
+# 'sysDescr.0' in a single pass. The numeric suffix is optional.
+_SYMBOLIC_OID_RE = re.compile(
+        r'\A(?:(?P<mib>[^:]*)::)?(?P<sym>[^.]+)(?:\.(?P<suffixes>.+))?\Z')
 
 
 def try_int(i):
-    try:
-        return int(i)
-    except ValueError:
-        return i
+    # A predicate check is much cheaper than raising and catching
+    # ValueError for every non-numeric OID label.
+    return int(i) if i.lstrip('-').isdigit() else i
 
 
 def is_string(string):
-    if (sys.version_info[0] >= 3):
-        return isinstance(string, str)
-    return isinstance(string, basestring)
+    return isinstance(string, str)
+
+
+# Robot suites tend to use the same few OID strings over and over again,
+# so the parsed tuples are memoized. The result is immutable, thus safe
+# to share between callers.
+@functools.lru_cache(maxsize=1024)
+def _parse_oid_string(oid):
+    # Fast path: purely numeric OIDs need no symbolic handling at all.
+    # map() with the int builtin runs the whole conversion in C.
+    if _NUMERIC_OID_RE.match(oid):
+        return tuple(map(int, oid[1:].split('.')))
+
+    if oid.startswith('.'):
+        # Mixed named and numeric labels, e.g. '.iso.org.6.internet...'.
+        return tuple(try_int(x) for x in oid[1:].split('.'))
+
+    m = _SYMBOLIC_OID_RE.match(oid)
+    if m is None:
+        raise ValueError('cannot parse OID "%s"' % oid)
+    mib = m.group('mib') or ''
+    suffixes = m.group('suffixes')
+    if suffixes is None:
+        suffixes = ()
+    else:
+        suffixes = tuple(try_int(x) for x in suffixes.split('.'))
+    return ((mib, m.group('sym')),) + suffixes
 
 
 # Interpret a string as OID. The following notations are possible:
@@ -34,31 +66,13 @@ def is_string(string):
 #   .iso.org.6.internet.2.1.1.1.0
 #   sysDescr.0
 def parse_oid(oid):
-    if not is_string(oid):
+    if not isinstance(oid, str):
         return oid
-    elif '::' in oid:
-        mib, sym = oid.split('::', 1)
-        oid = None
-    elif oid.startswith('.'):
-        oid = map(try_int, oid[1:].split('.'))
-        oid = tuple(oid)
-    else:
-        mib = ''
-        sym = oid
-        oid = None
-
-    if oid is None:
-        sym, suffixes = sym.split('.', 1)
-        suffixes = suffixes.split('.')
-        suffixes = map(try_int, suffixes)
-        suffixes = tuple(suffixes)
-        oid = ((mib, sym),) + suffixes
-
-    return oid
+    return _parse_oid_string(oid)
 
 
 def format_oid(oid):
-    return '.' + '.'.join(map(str, oid))
+    return '.' + '.'.join([str(x) for x in oid])
 
 
 # Interpret a string as an SNMP index. The following values are parsed:
@@ -1,3 +1,5 @@
+import inspect
+
 from nose.tools import eq_, raises
 from SnmpLibrary import SnmpLibrary
 
@@ -52,3 +54,13 @@ class TestSnmpLibrary(object):
     @raises(RuntimeError)
     def test_snmplibrary_find_index_ambiguous_match(self):
         self.s.find_index(1, a, '1', b, '0/10')
+
+    def test_snmplibrary_set_keyword_signatures(self):
+        # set_octetstring once lost its oid argument; lock the
+        # signature of the whole Set <Type> family
+        for name in ('octetstring', 'integer', 'integer32', 'counter32',
+                     'counter64', 'gauge32', 'unsigned32', 'timeticks',
+                     'ip_address'):
+            setter = getattr(self.s, 'set_' + name)
+            eq_(list(inspect.signature(setter).parameters),
+                ['oid', 'value', 'idx'])
@@ -9,6 +9,10 @@ def test_parse_oid():
     eq_(parse_oid('.iso.org.6'), ('iso', 'org', 6))
 
 
+def test_parse_oid_is_memoized():
+    assert parse_oid('.1.3.6.1.2.1.1.1') is parse_oid('.1.3.6.1.2.1.1.1')
+
+
 def test_format_oid():
     eq_(format_oid((1, 2, 3)), '.1.2.3')
     eq_(format_oid((1, 'iso', 'org', 3)), '.1.iso.org.3')